@@ -0,0 +1,288 @@
+"""
+CelesTrakからのTLEデータ取得とキャッシュを共有するユーティリティ
+"""
+
+import requests
+import os
+import sys
+import concurrent.futures
+import functools
+import gzip
+import time
+import orjson
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+
+# TLSハンドシェイクを使い回すための共有HTTPセッション（gzip転送を明示）
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+@functools.cache
+def get_git_root():
+    """
+    Get the git repository root directory
+    """
+    for parent in Path(__file__).resolve().parents:
+        if (parent / ".git").exists():
+            return parent
+    print("Error finding git root: .git not found", file=sys.stderr)
+    sys.exit(1)
+
+@functools.cache
+def ensure_data_dir():
+    """
+    データディレクトリが存在することを確認する関数
+    """
+    data_dir = "data"
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+def get_cache_file_path(satellite_group):
+    """
+    衛星グループのキャッシュファイルパスを取得する関数
+    キャッシュはgzip圧縮した生のTLEデータとして保存する
+
+    Args:
+        satellite_group (str): 衛星グループ名
+
+    Returns:
+        str: キャッシュファイルのパス
+    """
+    data_dir = ensure_data_dir()
+    return os.path.join(data_dir, f"{satellite_group}.tle.gz")
+
+def get_meta_file_path(cache_file_path):
+    """
+    キャッシュのメタ情報ファイル（タイムスタンプ・Last-Modified）のパスを取得する関数
+
+    Args:
+        cache_file_path (str): キャッシュファイルのパス
+
+    Returns:
+        str: メタ情報ファイルのパス
+    """
+    return cache_file_path.removesuffix('.tle.gz') + '.meta.json'
+
+def parse_tle_satellites(tle_lines):
+    """
+    TLEの行リストを3行ずつ衛星データの辞書に変換する関数
+
+    Args:
+        tle_lines (list): TLEテキストの行リスト
+
+    Returns:
+        list: TLE形式の衛星データリスト
+    """
+    satellites = []
+
+    for i in range(0, len(tle_lines), 3):
+        if i+2 < len(tle_lines):
+            satellites.append({
+                'name': tle_lines[i].strip(),
+                'line1': tle_lines[i+1].strip(),
+                'line2': tle_lines[i+2].strip()
+            })
+
+    return satellites
+
+def extract_orbital_fields_from_tle(line2_list):
+    """
+    TLEの2行目のリストから軌道要素を一括抽出する関数
+    全行を固定幅のバイト配列に詰め、NumPyで列ごとにまとめてパースする
+
+    Args:
+        line2_list (list): TLEの2行目のリスト
+
+    Returns:
+        tuple: (軌道傾斜角, 離心率, 平均運動) のNumPy配列
+
+    Raises:
+        ValueError: 必要な桁数に満たない行が含まれる場合
+    """
+    # 固定幅パースの前提が崩れないよう、行長の検証は一度だけまとめて行う
+    if any(len(line2) < 63 for line2 in line2_list):
+        raise ValueError("TLEの2行目が短すぎます（63桁未満の行があります）")
+
+    # 各行を70桁に揃えて連結し、(衛星数, 70)のバイト配列にする
+    buf = np.frombuffer(
+        "".join(line2.ljust(70) for line2 in line2_list).encode('ascii'),
+        dtype='S1'
+    ).reshape(-1, 70)
+
+    # TLE形式: 9-16桁目が軌道傾斜角、27-33桁目が離心率（0.省略）、53-63桁目が平均運動
+    inclinations = np.char.strip(buf[:, 8:16].view('S8').ravel()).astype(float)
+    # 離心率は小数点が省略されたゼロ埋め7桁なので、整数としてパースして1e-7を掛ける
+    eccentricities = buf[:, 26:33].view('S7').ravel().astype(float) * 1e-7
+    mean_motions = np.char.strip(buf[:, 52:63].view('S11').ravel()).astype(float)
+
+    return inclinations, eccentricities, mean_motions
+
+def is_cache_valid(cache_file_path, max_age_hours=24):
+    """
+    キャッシュが有効かどうかを判断する関数
+
+    Args:
+        cache_file_path (str): キャッシュファイルのパス
+        max_age_hours (int): キャッシュの最大有効時間（時間単位）
+
+    Returns:
+        bool: キャッシュが有効かどうか
+    """
+    if not os.path.exists(cache_file_path):
+        return False
+
+    # 最終更新時間からの経過秒数をエポック秒のまま比較する
+    return (time.time() - os.path.getmtime(cache_file_path)) < max_age_hours * 3600
+
+def load_satellites_from_cache(cache_file_path):
+    """
+    キャッシュから衛星データを読み込む関数
+
+    Args:
+        cache_file_path (str): キャッシュファイルのパス
+
+    Returns:
+        list: 衛星データのリスト
+    """
+    try:
+        # 生のTLEを伸長して行に分けるだけなので、JSONパースは発生しない
+        with gzip.open(cache_file_path, 'rb') as file:
+            tle_lines = file.read().decode('ascii', errors='replace').splitlines()
+        return parse_tle_satellites(tle_lines)
+    except Exception as e:
+        print(f"キャッシュの読み込み中にエラーが発生しました: {e}")
+        return None
+
+def get_cached_last_modified(cache_file_path):
+    """
+    キャッシュに保存したLast-Modifiedヘッダを取得する関数
+
+    Args:
+        cache_file_path (str): キャッシュファイルのパス
+
+    Returns:
+        str: Last-Modifiedヘッダの値（保存されていなければNone）
+    """
+    meta_file_path = get_meta_file_path(cache_file_path)
+    if not os.path.exists(meta_file_path):
+        return None
+
+    try:
+        with open(meta_file_path, 'rb') as file:
+            return orjson.loads(file.read()).get('last_modified')
+    except Exception:
+        return None
+
+def save_tle_to_cache(cache_file_path, tle_content, last_modified=None):
+    """
+    生のTLEデータをgzip圧縮してキャッシュに保存する関数
+
+    Args:
+        cache_file_path (str): キャッシュファイルのパス
+        tle_content (bytes): ダウンロードしたTLEデータ
+        last_modified (str): サーバが返したLast-Modifiedヘッダの値
+    """
+    try:
+        with gzip.open(cache_file_path, 'wb') as file:
+            file.write(tle_content)
+
+        meta = {
+            'timestamp': datetime.now().isoformat(),
+            'last_modified': last_modified
+        }
+        with open(get_meta_file_path(cache_file_path), 'wb') as file:
+            file.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+
+        print(f"TLEデータを{cache_file_path}にキャッシュしました。")
+    except Exception as e:
+        print(f"キャッシュの保存中にエラーが発生しました: {e}")
+
+def download_tle(satellite_group):
+    """
+    CelesTrakからTLEデータをダウンロードする関数
+    キャッシュ機能付き
+
+    Args:
+        satellite_group (str): 衛星グループ名 (例: 'starlink', 'iridium-next')
+
+    Returns:
+        list: TLE形式の衛星データリスト
+    """
+    cache_file_path = get_cache_file_path(satellite_group)
+
+    # キャッシュが有効な場合はキャッシュから読み込む
+    if is_cache_valid(cache_file_path):
+        print(f"{satellite_group}のキャッシュデータを使用します（有効期限: 24時間）")
+        cached_satellites = load_satellites_from_cache(cache_file_path)
+        if cached_satellites:
+            return cached_satellites
+
+    # キャッシュが無効または読み込めない場合は新しくダウンロード
+    print(f"{satellite_group}の最新データをダウンロードしています...")
+    url = f"https://celestrak.org/NORAD/elements/gp.php?GROUP={satellite_group}&FORMAT=tle"
+
+    try:
+        # 期限切れキャッシュがあれば条件付きGETで更新の有無だけを確認する
+        headers = {"Accept-Encoding": "gzip"}
+        last_modified = get_cached_last_modified(cache_file_path)
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = SESSION.get(url, headers=headers, timeout=(5, 30))
+
+        # 304なら上流のデータは変わっていないので、期限を延長してキャッシュを再利用
+        if response.status_code == 304:
+            print(f"{satellite_group}のデータは更新されていません。キャッシュを再利用します。")
+            os.utime(cache_file_path)
+            cached_satellites = load_satellites_from_cache(cache_file_path)
+            if cached_satellites:
+                return cached_satellites
+
+        if response.status_code != 200:
+            raise Exception(f"データのダウンロードに失敗しました: {response.status_code}")
+
+        # TLEはASCII固定なので、response.textの文字コード推定を通さずに一度だけデコードする
+        # splitlinesがCR/LFをまとめて処理するため、行ごとの改行除去も不要になる
+        tle_data = response.content.decode('ascii', errors='replace').splitlines()
+        satellites = parse_tle_satellites(tle_data)
+
+        # ダウンロードした生のTLEバイト列をそのままキャッシュに保存
+        save_tle_to_cache(cache_file_path, response.content,
+                          response.headers.get('Last-Modified'))
+
+        return satellites
+
+    except Exception as e:
+        print(f"データのダウンロード中にエラーが発生しました: {e}")
+
+        # エラーが発生した場合、既存のキャッシュがあればそれを使用
+        if os.path.exists(cache_file_path):
+            print("最新のダウンロードに失敗しました。既存のキャッシュデータを使用します。")
+            cached_satellites = load_satellites_from_cache(cache_file_path)
+            if cached_satellites:
+                return cached_satellites
+
+        return []
+
+def download_tle_groups(satellite_groups):
+    """
+    複数の衛星グループのTLEデータを並行ダウンロードする関数
+    グループごとの取得を重ねることで、待ち時間を合計ではなく最大に抑える
+
+    Args:
+        satellite_groups (list): 衛星グループ名のリスト
+
+    Returns:
+        dict: 衛星グループ名をキーとした衛星データリストの辞書
+    """
+    # ThreadPoolExecutorはmax_workers=0を受け付けないため、空リストは先に返す
+    if not satellite_groups:
+        return {}
+
+    # SESSIONはGETに対してスレッドセーフなので、そのまま並行利用できる
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(satellite_groups)) as executor:
+        results = executor.map(download_tle, satellite_groups)
+
+    return dict(zip(satellite_groups, results))
@@ -1,56 +1,50 @@
 #!/usr/bin/env python3
 """
-Generate TOC (Table of Contents) for README.md from git-indexed NN.md files
+Generate TOC (Table of Contents) for README.md from NN.md files
 """
 
-import re
-import subprocess
+import functools
+import mmap
+import os
 import sys
 from pathlib import Path
 
 
+@functools.cache
 def get_git_root():
     """Get the git repository root directory"""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return Path(result.stdout.strip())
-    except subprocess.CalledProcessError as e:
-        print(f"Error finding git root: {e}", file=sys.stderr)
-        sys.exit(1)
+    for parent in Path(__file__).resolve().parents:
+        if (parent / ".git").exists():
+            return parent
+    print("Error finding git root: .git not found", file=sys.stderr)
+    sys.exit(1)
 
 
-def get_git_indexed_md_files():
-    """Get list of NN.md files that are checked into git"""
-    try:
-        result = subprocess.run(
-            ["git", "ls-files"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        files = result.stdout.strip().split('\n')
-        # Filter for NN.md pattern and sort
-        md_files = [f for f in files if re.match(r'^\d{2}\.md$', f)]
-        return sorted(md_files)
-    except subprocess.CalledProcessError as e:
-        print(f"Error running git ls-files: {e}", file=sys.stderr)
-        sys.exit(1)
+def get_md_files():
+    """Get sorted list of NN.md files in the repository root"""
+    # glob側でパターンを絞るので、正規表現でのフィルタリングは不要
+    return sorted(p.name for p in Path().glob('[0-9][0-9].md'))
 
 
 def extract_title(md_file):
     """Extract the first H1 title from markdown file"""
     try:
-        with open(md_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('# '):
-                    return line[2:].strip()
-        return None
+        with open(md_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                # Search the raw bytes for the first H1 line; decode only the title
+                if m[:2] == b'# ':
+                    start = 0
+                else:
+                    pos = m.find(b'\n# ')
+                    if pos == -1:
+                        return None
+                    start = pos + 1
+                end = m.find(b'\n', start)
+                if end == -1:
+                    end = len(m)
+                return m[start + 2:end].decode('utf-8').strip()
     except Exception as e:
         print(f"Error reading {md_file}: {e}", file=sys.stderr)
         return None
@@ -89,17 +83,16 @@ def update_readme(toc_entries):
 def main():
     # Change to git repository root to ensure relative paths work
     git_root = get_git_root()
-    import os
     os.chdir(git_root)
 
-    # Get git-indexed NN.md files
-    md_files = get_git_indexed_md_files()
+    # Get NN.md files
+    md_files = get_md_files()
 
     if not md_files:
-        print("No NN.md files found in git index", file=sys.stderr)
+        print("No NN.md files found", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Found {len(md_files)} checked-in markdown files: {', '.join(md_files)}")
+    print(f"Found {len(md_files)} markdown files: {', '.join(md_files)}")
 
     # Generate TOC entries
     toc_entries = generate_toc_entries(md_files)